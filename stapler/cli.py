@@ -1,11 +1,14 @@
 import argparse
+import os
 import sys
 
 from colorama import init
 
 from .config import load_config
-from .core.engine import build_site
+from .core.engine import build_site, check_site
+from .plugins.deploy import deploy_site
 from .server import serve
+from .workspace import build_sites, load_workspace
 
 init()
 
@@ -20,15 +23,28 @@ def main():
         "command",
         nargs="?",
         default="build",
-        choices=["build", "serve"],
+        choices=["build", "serve", "check", "deploy"],
         help="Command to run (default: build)",
     )
 
     parser.add_argument(
         "-c",
         "--config",
-        default="stapler.toml",
-        help="Path to configuration file (default: stapler.toml)",
+        action="append",
+        help="Path to configuration file (default: stapler.toml), repeat to build several sites",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workspace",
+        help="Path to a workspace file listing several sites to build",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of sites to build at once (default: CPU count)",
     )
 
     parser.add_argument(
@@ -39,6 +55,12 @@ def main():
         help="Port for development server (default: 8000)",
     )
 
+    parser.add_argument(
+        "--skip-build",
+        action="store_true",
+        help="Deploy the existing build instead of building first",
+    )
+
     parser.add_argument(
         "--version",
         action="store_true",
@@ -53,8 +75,29 @@ def main():
         print(f"Stapler {__version__}")
         sys.exit(0)
 
+    config_paths = args.config or ["stapler.toml"]
+    jobs = args.jobs
+
+    if args.workspace:
+        try:
+            workspace_paths, workspace_jobs = load_workspace(args.workspace)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        config_paths = (args.config or []) + workspace_paths
+        jobs = jobs or workspace_jobs
+
+    if args.workspace or len(config_paths) > 1:
+        if args.command != "build":
+            print(f"Error: {args.command} only takes a single config")
+            sys.exit(1)
+        sys.exit(1 if build_sites(config_paths, jobs) else 0)
+
+    config_dir, config_path = os.path.split(config_paths[0])
     try:
-        config = load_config(args.config)
+        if config_dir:
+            os.chdir(config_dir)
+        config = load_config(config_path)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -63,7 +106,18 @@ def main():
         sys.exit(1)
 
     if args.command == "serve":
-        serve(config, args.port)
+        serve(config, args.port, config_path)
+    elif args.command == "check":
+        sys.exit(1 if check_site(config) else 0)
+    elif args.command == "deploy":
+        if not args.skip_build:
+            build_site(config)
+        try:
+            failed = deploy_site(config)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Deploy error: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
     else:
         build_site(config)
 
@@ -41,6 +41,10 @@ def get_build_dev_dir(config):
     return config.get("directories", {}).get("build_dev", "build-dev")
 
 
+def get_cache_dir(config):
+    return config.get("directories", {}).get("cache", ".stapler-cache")
+
+
 def get_templates_dir(config):
     templates = config.get("directories", {}).get("templates", "templates")
     return os.path.join(get_site_dir(config), templates)
@@ -61,6 +65,47 @@ def has_sitemap(config):
     return config.get("features", {}).get("sitemap", True)
 
 
+def has_search(config):
+    return config.get("features", {}).get("search", {}).get("enabled", False)
+
+
+def get_search_output_dir(config):
+    return config.get("features", {}).get("search", {}).get("output", "search")
+
+
+def get_search_prefix_length(config):
+    return config.get("features", {}).get("search", {}).get("prefix_length", 2)
+
+
+def has_images(config):
+    return config.get("features", {}).get("images", {}).get("enabled", False)
+
+
+def get_images_dir(config):
+    images = config.get("features", {}).get("images", {}).get("directory", "assets")
+    return os.path.join(get_site_dir(config), images)
+
+
+def get_image_widths(config):
+    return config.get("features", {}).get("images", {}).get("widths", [480, 960, 1600])
+
+
+def get_image_formats(config):
+    return config.get("features", {}).get("images", {}).get("formats", ["avif", "webp"])
+
+
+def get_image_quality(config):
+    return config.get("features", {}).get("images", {}).get("quality", 80)
+
+
+def get_image_workers(config):
+    return config.get("features", {}).get("images", {}).get("workers")
+
+
+def has_link_check(config):
+    return config.get("features", {}).get("links", {}).get("check", False)
+
+
 def has_feeds(config):
     feeds_config = config.get("features", {}).get("feeds", True)
     if isinstance(feeds_config, bool):
@@ -82,10 +127,96 @@ def get_feed_formats(config):
     return formats
 
 
+def get_feed_limit(config):
+    feeds_config = config.get("features", {}).get("feeds", True)
+    default = 50 if is_low_memory(config) else None
+    if isinstance(feeds_config, bool):
+        return default
+    return feeds_config.get("limit", default)
+
+
+def is_low_memory(config):
+    return config.get("build", {}).get("low_memory", False)
+
+
+def get_memory_budget(config):
+    return config.get("build", {}).get("memory_budget", 512)
+
+
+def get_watch_ignore(config):
+    defaults = [".git", ".hg", "__pycache__", ".DS_Store", "*.swp", "*.swo", "*.swx", "*~", ".#*", "#*#", "4913", "*.tmp"]
+    return defaults + config.get("serve", {}).get("ignore", [])
+
+
+def get_watch_debounce(config):
+    return config.get("serve", {}).get("debounce", 0.2)
+
+
+def get_deploy_backend(config):
+    return config.get("deploy", {}).get("backend", "local")
+
+
+def get_deploy_target(config):
+    return config.get("deploy", {}).get("target")
+
+
+def get_deploy_s3(config):
+    return config.get("deploy", {}).get("s3", {})
+
+
+def get_deploy_workers(config):
+    return config.get("deploy", {}).get("workers", 8)
+
+
+def get_deploy_delete(config):
+    return config.get("deploy", {}).get("delete", True)
+
+
+def get_deploy_cache_control(config):
+    return config.get("deploy", {}).get("cache_control", {})
+
+
 def get_base_path(config):
     return config.get("site", {}).get("base_path", "")
 
 
+def has_i18n(config):
+    return bool(get_locales(config))
+
+
+def get_locales(config):
+    return config.get("i18n", {}).get("locales", [])
+
+
+def get_default_locale(config):
+    locales = get_locales(config)
+    return config.get("i18n", {}).get("default", locales[0] if locales else None)
+
+
+def get_locale_prefix(config, locale):
+    if locale == get_default_locale(config) and not config.get("i18n", {}).get("prefix_default", False):
+        return ""
+    return f"/{locale}"
+
+
+def get_locales_dir(config):
+    if not has_i18n(config):
+        return None
+    locales = config.get("i18n", {}).get("directory", "locales")
+    return os.path.join(get_site_dir(config), locales)
+
+
+def get_translations_dir(config):
+    if not has_i18n(config):
+        return None
+    translations = config.get("i18n", {}).get("translations", "translations")
+    return os.path.join(get_site_dir(config), translations)
+
+
+def get_site_language(config):
+    return config.get("site", {}).get("language", "en")
+
+
 def get_site_url(config):
     return config["site"]["url"]
 
@@ -1,3 +1,5 @@
+import gc
+import hashlib
 import os
 import shutil
 import tempfile
@@ -5,18 +7,20 @@ import time
 
 from colorama import Fore, Style
 from jinja2 import Environment, FileSystemLoader
-from markdown import Markdown
 
 from .. import config as cfg
-from ..plugins import blog, sitemap
-from .utils import get_data, infer_page_metadata, parse_front_matter, warn
+from ..plugins import blog, i18n, images, links, search, sitemap
+from .utils import MarkdownRenderer, get_data, get_peak_rss_mb, get_rss_mb, infer_page_metadata, parse_front_matter, warn, write_page
 
 
-def build_site(config, output_dir=None, is_dev=False):
+def build_site(config, output_dir=None, is_dev=False, check_links=None):
     if output_dir is None:
         output_dir = cfg.get_build_dev_dir(config) if is_dev else cfg.get_build_dir(config)
+    if check_links is None:
+        check_links = cfg.has_link_check(config)
 
     start_time = time.time()
+    timings = {}
     print(f"{Fore.CYAN}=> Building site <={Style.RESET_ALL}")
 
     print("> Setting up environment... ", end="", flush=True)
@@ -27,56 +31,209 @@ def build_site(config, output_dir=None, is_dev=False):
     templates_dir = cfg.get_templates_dir(config)
     if os.path.exists(templates_dir):
         loader_paths.append(templates_dir)
-    template_env = Environment(loader=FileSystemLoader(loader_paths))
+    extensions = ["jinja2.ext.i18n"] if cfg.has_i18n(config) else []
+    template_env = Environment(loader=FileSystemLoader(loader_paths), extensions=extensions)
 
-    md_processor = Markdown(extensions=cfg.get_markdown_extensions(config))
+    md_processor = MarkdownRenderer(cfg.get_markdown_extensions(config), cache=not cfg.is_low_memory(config))
     data = get_data()
 
+    page_hooks = []
+    search_indexer = None
+    if cfg.has_search(config):
+        search_indexer = search.SearchIndexer(config)
+        page_hooks.append(search_indexer.add_page)
+
+    link_checker = None
+    if check_links:
+        link_checker = links.LinkChecker(config)
+        page_hooks.append(link_checker.add_page)
+
+    if cfg.is_low_memory(config):
+        page_hooks.append(_memory_guard(config))
+
     setup_time = time.time() - setup_start
-    print(f"{Fore.GREEN}done ({setup_time * 1000:.0f}ms){Style.RESET_ALL}")
 
-    posts = []
-    if cfg.has_blog(config):
-        print("> Processing blog posts... ", end="", flush=True)
-        blog_start = time.time()
-        posts = blog.process_blog(config, template_env, md_processor, data, temp_build_dir)
-        blog_time = time.time() - blog_start
-        print(f"{Fore.GREEN}{len(posts)} posts ({blog_time * 1000:.0f}ms){Style.RESET_ALL}")
+    timings["setup"] = setup_time
+    print(f"{Fore.GREEN}done ({setup_time * 1000:.0f}ms){Style.RESET_ALL}")
 
-    print("> Processing site files... ", end="", flush=True)
-    files_start = time.time()
-    _process_site_files(config, template_env, md_processor, data, temp_build_dir)
-    files_time = time.time() - files_start
-    print(f"{Fore.GREEN}done ({files_time * 1000:.0f}ms){Style.RESET_ALL}")
+    image_manifest = {}
+    if cfg.has_images(config):
+        print("> Processing images... ", end="", flush=True)
+        images_start = time.time()
+        image_manifest, generated = images.process_images(config, temp_build_dir)
+        images_time = time.time() - images_start
+        timings["images"] = images_time
+        print(f"{Fore.GREEN}{len(image_manifest)} images, {generated} new variants ({images_time * 1000:.0f}ms){Style.RESET_ALL}")
+    images.register_helpers(template_env, config, image_manifest)
+
+    if cfg.has_i18n(config):
+        print("> Copying static files... ", end="", flush=True)
+        static_start = time.time()
+        _process_site_files(config, template_env, md_processor, data, temp_build_dir, include="static")
+        static_time = time.time() - static_start
+        timings["files"] = static_time
+        print(f"{Fore.GREEN}done ({static_time * 1000:.0f}ms){Style.RESET_ALL}")
+
+    posts = {}
+    for locale in cfg.get_locales(config) or [None]:
+        locale_config = config
+        locale_build_dir = temp_build_dir
+        locale_hooks = page_hooks
+        overlay_dir = None
+        label = ""
+        if locale:
+            prefix = cfg.get_locale_prefix(config, locale)
+            locale_config = i18n.locale_config(config, locale)
+            locale_build_dir = os.path.join(temp_build_dir, prefix.lstrip("/"))
+            locale_hooks = i18n.prefix_hooks(page_hooks, prefix)
+            overlay_dir = i18n.get_overlay_dir(config, locale)
+            label = f" [{locale}]"
+            i18n.install_translations(template_env, config, locale)
+
+        if cfg.has_blog(config):
+            print(f"> Processing blog posts{label}... ", end="", flush=True)
+            blog_start = time.time()
+            locale_posts = blog.process_blog(locale_config, template_env, md_processor, data, locale_build_dir, locale_hooks, overlay_dir)
+            posts[locale] = locale_posts
+            blog_time = time.time() - blog_start
+            timings["blog"] = timings.get("blog", 0) + blog_time
+            print(f"{Fore.GREEN}{len(locale_posts)} posts ({blog_time * 1000:.0f}ms){Style.RESET_ALL}")
+
+        print(f"> Processing site files{label}... ", end="", flush=True)
+        files_start = time.time()
+        include = "pages" if locale else "all"
+        _process_site_files(locale_config, template_env, md_processor, data, locale_build_dir, locale_hooks, overlay_dir, include)
+        files_time = time.time() - files_start
+        timings["files"] = timings.get("files", 0) + files_time
+        print(f"{Fore.GREEN}done ({files_time * 1000:.0f}ms){Style.RESET_ALL}")
+
+    if search_indexer:
+        print("> Writing search index... ", end="", flush=True)
+        search_start = time.time()
+        page_count, shard_count = search_indexer.write(temp_build_dir)
+        search_time = time.time() - search_start
+        timings["search"] = search_time
+        print(f"{Fore.GREEN}{page_count} pages, {shard_count} shards, {search_indexer.reused} cached ({search_time * 1000:.0f}ms){Style.RESET_ALL}")
 
     if cfg.has_sitemap(config):
         print("> Generating sitemap... ", end="", flush=True)
         sitemap_start = time.time()
         sitemap.generate_sitemap(config, temp_build_dir, posts)
         sitemap_time = time.time() - sitemap_start
+        timings["sitemap"] = sitemap_time
         print(f"{Fore.GREEN}done ({sitemap_time * 1000:.0f}ms){Style.RESET_ALL}")
 
+    broken_links = []
+    if link_checker:
+        print("> Checking links... ", end="", flush=True)
+        links_start = time.time()
+        broken_links = link_checker.check(temp_build_dir)
+        links_time = time.time() - links_start
+        timings["links"] = links_time
+        color = Fore.YELLOW if broken_links else Fore.GREEN
+        print(f"{color}{len(broken_links)} broken ({links_time * 1000:.0f}ms){Style.RESET_ALL}")
+        for page, link in broken_links:
+            warn(f"Broken link in {page}: {link}")
+
     print("> Finalizing build... ", end="", flush=True)
     finalize_start = time.time()
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
     shutil.move(temp_build_dir, output_dir)
     finalize_time = time.time() - finalize_start
+    timings["finalize"] = finalize_time
     print(f"{Fore.GREEN}done ({finalize_time * 1000:.0f}ms){Style.RESET_ALL}")
 
     total_time = time.time() - start_time
-    print(f"{Fore.GREEN}Build complete in {total_time * 1000:.0f}ms!{Style.RESET_ALL}\n")
+    peak_rss = get_peak_rss_mb() if cfg.is_low_memory(config) else None
+    if peak_rss:
+        print(f"{Fore.GREEN}Build complete in {total_time * 1000:.0f}ms (peak RSS {peak_rss:.0f}MB)!{Style.RESET_ALL}\n")
+    else:
+        print(f"{Fore.GREEN}Build complete in {total_time * 1000:.0f}ms!{Style.RESET_ALL}\n")
 
+    return {"total_time": total_time, "timings": timings, "broken_links": broken_links}
 
-def _process_site_files(config, template_env, md_processor, data, build_dir):
-    seen_outputs = {}
-    exclude_dirs = [cfg.get_templates_dir(config)]
-    blog_dir = cfg.get_blog_dir(config)
-    if blog_dir:
-        exclude_dirs.append(blog_dir)
 
+def check_site(config):
+    output_dir = tempfile.mkdtemp()
+    try:
+        return build_site(config, output_dir=output_dir, check_links=True)["broken_links"]
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def _memory_guard(config):
+    budget = cfg.get_memory_budget(config)
+    step = max(budget / 4, 16)
+    threshold = budget
+
+    def check(rel_path, content):
+        nonlocal threshold
+        rss = get_rss_mb()
+        if rss and rss > threshold:
+            gc.collect()
+            threshold = max(budget, get_rss_mb() or rss) + step
+
+    return check
+
+
+def _process_site_files(config, template_env, md_processor, data, build_dir, page_hooks=(), overlay_dir=None, include="all"):
+    low_memory = cfg.is_low_memory(config)
+    seen_outputs = set() if low_memory else {}
+
+    for filepath, rel_path in _site_sources(config, overlay_dir, include):
+        if rel_path.endswith(".md"):
+            output_path = os.path.join(build_dir, rel_path[:-3] + ".html")
+        else:
+            output_path = os.path.join(build_dir, rel_path)
+
+        if low_memory:
+            output_key = hashlib.blake2b(output_path.encode("utf-8"), digest_size=8).digest()
+            if output_key in seen_outputs:
+                warn(f"Duplicate output: {output_path} (from {filepath})")
+            seen_outputs.add(output_key)
+        else:
+            if output_path in seen_outputs:
+                warn(f"Duplicate output: {output_path} (from {filepath} and {seen_outputs[output_path]})")
+            seen_outputs[output_path] = filepath
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        if filepath.endswith(".md"):
+            _process_markdown_file(config, template_env, md_processor, data, filepath, output_path, rel_path, build_dir, page_hooks)
+        elif filepath.endswith(".html"):
+            _process_html_file(config, template_env, data, filepath, output_path, rel_path, build_dir, page_hooks)
+        else:
+            shutil.copy2(filepath, output_path)
+
+
+def _site_sources(config, overlay_dir=None, include="all"):
     site_dir = cfg.get_site_dir(config)
-    for root, dirs, files in os.walk(site_dir):
+    blog_dir = cfg.get_blog_dir(config)
+
+    overridden = set()
+    if overlay_dir:
+        overlay_excludes = [os.path.join(overlay_dir, os.path.relpath(blog_dir, site_dir))] if blog_dir else []
+        for filepath, rel_path in _walk_files(overlay_dir, overlay_excludes):
+            overridden.add(rel_path)
+            yield filepath, rel_path
+
+    exclude_dirs = [cfg.get_templates_dir(config)]
+    for directory in (blog_dir, cfg.get_locales_dir(config), cfg.get_translations_dir(config)):
+        if directory:
+            exclude_dirs.append(directory)
+
+    for filepath, rel_path in _walk_files(site_dir, exclude_dirs):
+        if rel_path in overridden:
+            continue
+        is_page = rel_path.endswith((".md", ".html"))
+        if (include == "pages" and not is_page) or (include == "static" and is_page):
+            continue
+        yield filepath, rel_path
+
+
+def _walk_files(base_dir, exclude_dirs):
+    for root, dirs, files in os.walk(base_dir):
         dirs[:] = [d for d in dirs if os.path.join(root, d) not in exclude_dirs]
 
         for filename in files:
@@ -87,39 +244,19 @@ def _process_site_files(config, template_env, md_processor, data, build_dir):
             if filename.startswith("."):
                 continue
 
-            rel_path = os.path.relpath(filepath, site_dir)
-
-            if rel_path.endswith(".md"):
-                output_path = os.path.join(build_dir, rel_path[:-3] + ".html")
-            else:
-                output_path = os.path.join(build_dir, rel_path)
-
-            if output_path in seen_outputs:
-                warn(f"Duplicate output: {output_path} (from {filepath} and {seen_outputs[output_path]})")
-            seen_outputs[output_path] = filepath
-
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-            if filepath.endswith(".md"):
-                _process_markdown_file(config, template_env, md_processor, data, filepath, output_path, rel_path)
-            elif filepath.endswith(".html"):
-                _process_html_file(config, template_env, data, filepath, output_path, rel_path)
-            else:
-                shutil.copy2(filepath, output_path)
+            yield filepath, os.path.relpath(filepath, base_dir)
 
 
-def _process_markdown_file(config, template_env, md_processor, data, filepath, output_path, rel_path):
+def _process_markdown_file(config, template_env, md_processor, data, filepath, output_path, rel_path, build_dir, page_hooks=()):
     with open(filepath, "r", encoding="utf-8") as f:
         content = f.read()
 
     metadata, markdown_content = parse_front_matter(content)
     html_content = md_processor.convert(markdown_content)
-    md_processor.reset()
 
     template_name = metadata.get("template")
     if not template_name:
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        write_page(output_path, html_content, build_dir, page_hooks)
         return
 
     try:
@@ -135,13 +272,12 @@ def _process_markdown_file(config, template_env, md_processor, data, filepath, o
         template = template_env.get_template(template_name)
         rendered = template.render(page=page_data, data=data)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(rendered)
+        write_page(output_path, rendered, build_dir, page_hooks)
     except Exception as e:
         warn(f"Failed to render {filepath}: {e}")
 
 
-def _process_html_file(config, template_env, data, filepath, output_path, rel_path):
+def _process_html_file(config, template_env, data, filepath, output_path, rel_path, build_dir, page_hooks=()):
     with open(filepath, "r", encoding="utf-8") as f:
         content = f.read()
 
@@ -167,7 +303,7 @@ def _process_html_file(config, template_env, data, filepath, output_path, rel_pa
     else:
         try:
             active_page, canonical_path = infer_page_metadata(rel_path, cfg.get_base_path(config))
-            template = template_env.from_string(content)
+            template = template_env.get_template(os.path.relpath(filepath, cfg.get_site_dir(config)).replace(os.sep, "/"))
             rendered = template.render(
                 active_page=active_page,
                 canonical_path=canonical_path,
@@ -177,5 +313,4 @@ def _process_html_file(config, template_env, data, filepath, output_path, rel_pa
             warn(f"Failed to render {filepath}: {e}")
             return
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(rendered)
+    write_page(output_path, rendered, build_dir, page_hooks)
@@ -1,13 +1,25 @@
+import hashlib
+import json
 import os
 import re
 import subprocess
+import sys
 from datetime import datetime, timezone
 
 import yaml
 from colorama import Fore, Style
+from markdown import Markdown
+
+from .. import config as cfg
 
 
 FRONT_MATTER_PATTERN = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+MARKDOWN_CACHE_SIZE = 4096
+
+_markdown_cache = {}
+_git_root_cache = {}
+_git_commit_cache = {}
+_git_date_cache = {}
 
 
 def warn(message):
@@ -23,10 +35,135 @@ def parse_front_matter(content):
     return {}, content
 
 
-def get_git_commit_info():
+class MarkdownRenderer:
+    def __init__(self, extensions, cache=True):
+        self.processor = Markdown(extensions=extensions)
+        self.key = tuple(extensions)
+        self.cache = cache
+
+    def convert(self, text):
+        if not self.cache:
+            return self._convert(text)
+
+        key = (self.key, hashlib.sha1(text.encode("utf-8")).digest())
+        html = _markdown_cache.get(key)
+        if html is None:
+            if len(_markdown_cache) >= MARKDOWN_CACHE_SIZE:
+                _markdown_cache.clear()
+            html = _markdown_cache[key] = self._convert(text)
+        return html
+
+    def _convert(self, text):
+        html = self.processor.convert(text)
+        self.processor.reset()
+        return html
+
+
+def write_page(output_path, content, build_dir, page_hooks=()):
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+    if page_hooks:
+        rel_path = os.path.relpath(output_path, build_dir).replace(os.sep, "/")
+        for hook in page_hooks:
+            hook(rel_path, content)
+
+
+def load_cache(config, name):
+    path = os.path.join(cfg.get_cache_dir(config), f"{name}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cache(config, name, data):
+    cache_dir = cfg.get_cache_dir(config)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def get_rss_mb():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def get_peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def clear_git_cache():
+    _git_root_cache.clear()
+    _git_commit_cache.clear()
+    _git_date_cache.clear()
+
+
+def export_git_cache():
+    return {"roots": dict(_git_root_cache), "commits": dict(_git_commit_cache)}
+
+
+def load_git_cache(state):
+    _git_root_cache.update(state["roots"])
+    _git_commit_cache.update(state["commits"])
+
+
+def get_git_commit_info(cwd=None):
+    root = _get_git_root(os.path.abspath(cwd or os.getcwd()))
+    if root not in _git_commit_cache:
+        _git_commit_cache[root] = _read_git_commit_info(root)
+    return _git_commit_cache[root]
+
+
+def get_git_file_date(filepath):
+    filepath = os.path.abspath(filepath)
+    if filepath in _git_date_cache:
+        return _git_date_cache[filepath]
+
+    try:
+        output = subprocess.check_output(
+            ["git", "log", "--follow", "--format=%H %ct", "--", filepath],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+        if output:
+            first_commit_ts = int(output.split("\n")[-1].split()[1])
+            _git_date_cache[filepath] = datetime.fromtimestamp(first_commit_ts, tz=timezone.utc)
+            return _git_date_cache[filepath]
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        pass
+    return None
+
+
+def _get_git_root(cwd):
+    if cwd not in _git_root_cache:
+        try:
+            root = subprocess.check_output(
+                ["git", "rev-parse", "--show-toplevel"],
+                cwd=cwd,
+                text=True,
+                stderr=subprocess.DEVNULL,
+            ).strip()
+        except (subprocess.CalledProcessError, FileNotFoundError, NotADirectoryError):
+            root = None
+        _git_root_cache[cwd] = root or cwd
+    return _git_root_cache[cwd]
+
+
+def _read_git_commit_info(cwd):
     try:
         output = subprocess.check_output(
             ["git", "log", "-1", "--format=%h %H %ct"],
+            cwd=cwd,
             text=True,
             stderr=subprocess.DEVNULL,
         ).strip()
@@ -48,7 +185,7 @@ def get_git_commit_info():
                         "iso": commit_dt.isoformat(),
                     },
                 }
-    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+    except (subprocess.CalledProcessError, FileNotFoundError, NotADirectoryError, ValueError):
         pass
     return None
 
@@ -68,6 +205,23 @@ def get_data():
     }
 
 
+def resolve_clean_url(url_path, is_file):
+    if url_path.endswith("/") or url_path == "":
+        index_path = url_path.rstrip("/") + "/index.html"
+        if is_file(index_path):
+            return index_path
+
+    if is_file(url_path):
+        return url_path
+
+    if not url_path.endswith("/") and "." not in url_path.rsplit("/", 1)[-1]:
+        html_path = url_path + ".html"
+        if is_file(html_path):
+            return html_path
+
+    return None
+
+
 def infer_page_metadata(rel_path, base_path=""):
     if rel_path == "index.html":
         canonical_path = base_path if base_path else "/"
@@ -1,22 +1,28 @@
 import os
-import subprocess
 from datetime import datetime, timezone
 
 from feedgen.feed import FeedGenerator
 
 from .. import config as cfg
-from ..core.utils import parse_front_matter, warn
+from ..core.utils import get_git_file_date, parse_front_matter, warn, write_page
 
 
-def process_blog(config, template_env, md_processor, data, build_dir):
+def process_blog(config, template_env, md_processor, data, build_dir, page_hooks=(), overlay_dir=None):
     posts = []
     blog_slugs = set()
+    low_memory = cfg.is_low_memory(config)
 
     blog_dir = cfg.get_blog_dir(config)
     if not os.path.exists(blog_dir):
         return posts
 
-    for filename in os.listdir(blog_dir):
+    sources = {filename: os.path.join(blog_dir, filename) for filename in os.listdir(blog_dir)}
+    if overlay_dir:
+        overlay_blog_dir = os.path.join(overlay_dir, os.path.relpath(blog_dir, cfg.get_site_dir(config)))
+        if os.path.isdir(overlay_blog_dir):
+            sources.update((filename, os.path.join(overlay_blog_dir, filename)) for filename in os.listdir(overlay_blog_dir))
+
+    for filename, filepath in sources.items():
         if not filename.endswith(".md"):
             continue
 
@@ -25,8 +31,7 @@ def process_blog(config, template_env, md_processor, data, build_dir):
             warn(f"Duplicate blog slug: {slug}")
         blog_slugs.add(slug)
 
-        filepath = os.path.join(blog_dir, filename)
-        post = _process_post(config, md_processor, filepath, slug)
+        post = _process_post(config, md_processor, filepath, slug, render=not low_memory)
         if post:
             posts.append(post)
 
@@ -39,8 +44,8 @@ def process_blog(config, template_env, md_processor, data, build_dir):
     blog_build_dir = os.path.join(build_dir, blog_section)
     os.makedirs(blog_build_dir, exist_ok=True)
 
-    _generate_blog_index(config, template_env, data, blog_build_dir, blog_section, posts)
-    _generate_post_pages(config, template_env, data, blog_build_dir, blog_section, posts)
+    _generate_blog_index(config, template_env, data, build_dir, blog_section, posts, page_hooks)
+    _generate_post_pages(config, template_env, md_processor, data, build_dir, blog_section, posts, page_hooks)
 
     if cfg.has_feeds(config):
         _generate_feeds(config, blog_build_dir, blog_section, posts)
@@ -48,13 +53,9 @@ def process_blog(config, template_env, md_processor, data, build_dir):
     return posts
 
 
-def _process_post(config, md_processor, filepath, slug):
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    metadata, markdown_content = parse_front_matter(content)
-    html_content = md_processor.convert(markdown_content)
-    md_processor.reset()
+def _process_post(config, md_processor, filepath, slug, render=True):
+    metadata, markdown_content = _read_post(filepath)
+    html_content = md_processor.convert(markdown_content) if render else None
 
     date_str = metadata.get("date")
     if date_str:
@@ -63,7 +64,7 @@ def _process_post(config, md_processor, filepath, slug):
         else:
             created_date = datetime.combine(date_str, datetime.min.time()).replace(tzinfo=timezone.utc)
     else:
-        created_date = _get_git_date(filepath)
+        created_date = get_git_file_date(filepath)
         if not created_date:
             warn(f"No date found for blog post: {os.path.basename(filepath)}")
 
@@ -82,53 +83,55 @@ def _process_post(config, md_processor, filepath, slug):
     return post
 
 
-def _get_git_date(filepath):
-    try:
-        output = subprocess.check_output(
-            ["git", "log", "--follow", "--format=%H %ct", "--", filepath],
-            text=True,
-            stderr=subprocess.DEVNULL,
-        ).strip()
-        if output:
-            first_commit_ts = int(output.split("\n")[-1].split()[1])
-            return datetime.fromtimestamp(first_commit_ts, tz=timezone.utc)
-    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-        pass
-    return None
+def _read_post(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read()
+    return parse_front_matter(content)
 
 
-def _generate_blog_index(config, template_env, data, blog_dir, blog_section, posts):
+def _generate_blog_index(config, template_env, data, build_dir, blog_section, posts, page_hooks=()):
     base_path = cfg.get_base_path(config)
     canonical_path = f"{base_path}/{blog_section}" if base_path else f"/{blog_section}"
 
-    with open(os.path.join(blog_dir, "index.html"), "w", encoding="utf-8") as f:
-        f.write(
-            template_env.get_template(cfg.get_blog_index_template(config)).render(
-                posts=posts,
-                active_page=blog_section,
-                canonical_path=canonical_path,
-                data=data,
-            )
-        )
+    write_page(
+        os.path.join(build_dir, blog_section, "index.html"),
+        template_env.get_template(cfg.get_blog_index_template(config)).render(
+            posts=posts,
+            active_page=blog_section,
+            canonical_path=canonical_path,
+            data=data,
+        ),
+        build_dir,
+        page_hooks,
+    )
 
 
-def _generate_post_pages(config, template_env, data, blog_dir, blog_section, posts):
+def _generate_post_pages(config, template_env, md_processor, data, build_dir, blog_section, posts, page_hooks=()):
     base_path = cfg.get_base_path(config)
-    for post in posts:
+    feed_limit = cfg.get_feed_limit(config) if cfg.has_feeds(config) else 0
+    for index, post in enumerate(posts):
+        streamed = post["content"] is None
+        if streamed:
+            post["content"] = md_processor.convert(_read_post(post["filepath"])[1])
+
         canonical_path = (
             f"{base_path}/{blog_section}/{post['slug']}" if base_path else f"/{blog_section}/{post['slug']}"
         )
 
-        post_path = os.path.join(blog_dir, f"{post['slug']}.html")
-        with open(post_path, "w", encoding="utf-8") as f:
-            f.write(
-                template_env.get_template(cfg.get_blog_template(config)).render(
-                    post=post,
-                    active_page=blog_section,
-                    canonical_path=canonical_path,
-                    data=data,
-                )
-            )
+        write_page(
+            os.path.join(build_dir, blog_section, f"{post['slug']}.html"),
+            template_env.get_template(cfg.get_blog_template(config)).render(
+                post=post,
+                active_page=blog_section,
+                canonical_path=canonical_path,
+                data=data,
+            ),
+            build_dir,
+            page_hooks,
+        )
+
+        if streamed and feed_limit is not None and index >= feed_limit:
+            post["content"] = None
 
 
 def _generate_feeds(config, blog_dir, blog_section, posts):
@@ -137,7 +140,7 @@ def _generate_feeds(config, blog_dir, blog_section, posts):
     fg.description(cfg.get_site_description(config))
     fg.id(cfg.get_site_url(config))
     fg.link(href=f"{cfg.get_site_url(config)}/{blog_section}", rel="alternate")
-    fg.language("en")
+    fg.language(cfg.get_site_language(config))
 
     author_name = cfg.get_author_name(config)
     if author_name:
@@ -147,7 +150,7 @@ def _generate_feeds(config, blog_dir, blog_section, posts):
             uri=cfg.get_site_url(config),
         )
 
-    for post in posts:
+    for post in posts[: cfg.get_feed_limit(config)]:
         fe = fg.add_entry()
         fe.title(post["title"])
         fe.link(href=f"{cfg.get_site_url(config)}/{blog_section}/{post['slug']}")
@@ -0,0 +1,250 @@
+import fnmatch
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from colorama import Fore, Style
+
+from .. import config as cfg
+from ..core.utils import warn
+
+
+MANIFEST_NAME = ".stapler-manifest.json"
+REVALIDATE = "public, max-age=0, must-revalidate"
+TEXT_TYPES = {"application/javascript", "application/json", "application/xml", "image/svg+xml"}
+
+
+class LocalBackend:
+    def __init__(self, config):
+        self.target = cfg.get_deploy_target(config)
+        if not self.target:
+            raise ValueError("deploy.target is required for the local backend")
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.target, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def upload(self, rel_path, local_path, headers):
+        target_path = os.path.join(self.target, rel_path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        temp_path = f"{target_path}.{os.getpid()}.tmp"
+        shutil.copy2(local_path, temp_path)
+        os.replace(temp_path, target_path)
+
+    def delete(self, rel_path):
+        target_path = os.path.join(self.target, rel_path)
+        try:
+            os.remove(target_path)
+        except FileNotFoundError:
+            return
+
+        parent = os.path.dirname(target_path)
+        while os.path.abspath(parent) != os.path.abspath(self.target):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                # not empty yet, or a concurrent delete already removed it
+                return
+            parent = os.path.dirname(parent)
+
+    def write_manifest(self, manifest):
+        os.makedirs(self.target, exist_ok=True)
+        with open(os.path.join(self.target, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+
+
+class S3Backend:
+    def __init__(self, config):
+        try:
+            import boto3
+            from botocore.config import Config
+            from botocore.exceptions import BotoCoreError
+        except ImportError:
+            raise ValueError("the s3 backend needs boto3 (pip install 'stapler-ssg[deploy]')")
+
+        s3 = cfg.get_deploy_s3(config)
+        if not s3.get("bucket"):
+            raise ValueError("deploy.s3.bucket is required for the s3 backend")
+
+        self.bucket = s3["bucket"]
+        self.prefix = s3.get("prefix", "").strip("/")
+        try:
+            self.client = boto3.client(
+                "s3",
+                endpoint_url=s3.get("endpoint_url"),
+                region_name=s3.get("region"),
+                config=Config(max_pool_connections=cfg.get_deploy_workers(config)),
+            )
+        except BotoCoreError as e:
+            raise ValueError(f"could not set up the s3 client: {e}") from e
+
+    def read_manifest(self):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(MANIFEST_NAME))
+            return json.loads(response["Body"].read())
+        except (BotoCoreError, ClientError) as e:
+            if isinstance(e, ClientError) and e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return {}
+            raise ValueError(f"could not read the manifest from s3://{self.bucket}: {e}") from e
+        except ValueError:
+            return {}
+
+    def upload(self, rel_path, local_path, headers):
+        with open(local_path, "rb") as f:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self._key(rel_path),
+                Body=f,
+                ContentType=headers["Content-Type"],
+                CacheControl=headers["Cache-Control"],
+            )
+
+    def delete(self, rel_path):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(rel_path))
+
+    def write_manifest(self, manifest):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self._key(MANIFEST_NAME),
+                Body=json.dumps(manifest, separators=(",", ":")).encode("utf-8"),
+                ContentType="application/json",
+                CacheControl="no-store",
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise ValueError(f"could not write the manifest to s3://{self.bucket}: {e}") from e
+
+    def _key(self, rel_path):
+        return f"{self.prefix}/{rel_path}" if self.prefix else rel_path
+
+
+BACKENDS = {"local": LocalBackend, "s3": S3Backend}
+
+
+def deploy_site(config, build_dir=None):
+    if build_dir is None:
+        build_dir = cfg.get_build_dir(config)
+    if not os.path.isdir(build_dir):
+        raise FileNotFoundError(f"Build directory not found: {build_dir}")
+
+    backend_name = cfg.get_deploy_backend(config)
+    if backend_name not in BACKENDS:
+        raise ValueError(f"Unknown deploy backend: {backend_name}. Use {' or '.join(BACKENDS)}")
+
+    start_time = time.time()
+    print(f"{Fore.CYAN}=> Deploying site ({backend_name}) <={Style.RESET_ALL}")
+
+    backend = BACKENDS[backend_name](config)
+    deployed = backend.read_manifest()
+    print("> Comparing manifests... ", end="", flush=True)
+    manifest = build_manifest(build_dir)
+    changed = [rel_path for rel_path, digest in manifest.items() if deployed.get(rel_path) != digest]
+    removed = [rel_path for rel_path in deployed if rel_path not in manifest] if cfg.get_deploy_delete(config) else []
+    print(f"{Fore.GREEN}{len(changed)} changed, {len(removed)} removed, {len(manifest) - len(changed)} unchanged{Style.RESET_ALL}")
+
+    rules = _cache_control_rules(config)
+
+    def upload(rel_path):
+        headers = {
+            "Content-Type": content_type(rel_path),
+            "Cache-Control": cache_control(rules, rel_path),
+        }
+        backend.upload(rel_path, os.path.join(build_dir, rel_path), headers)
+
+    failed = set()
+    with ThreadPoolExecutor(max_workers=cfg.get_deploy_workers(config)) as pool:
+        if changed:
+            print("> Uploading files... ", end="", flush=True)
+            upload_start = time.time()
+            upload_failed = _run_all(pool, upload, changed)
+            upload_time = time.time() - upload_start
+            print(f"{Fore.GREEN}{len(changed) - len(upload_failed)} uploaded ({upload_time * 1000:.0f}ms){Style.RESET_ALL}")
+            for rel_path, error in upload_failed.items():
+                warn(f"Failed to upload {rel_path}: {error}")
+            failed.update(upload_failed)
+
+        if removed:
+            print("> Deleting removed files... ", end="", flush=True)
+            delete_start = time.time()
+            delete_failed = _run_all(pool, backend.delete, removed)
+            delete_time = time.time() - delete_start
+            print(f"{Fore.GREEN}{len(removed) - len(delete_failed)} deleted ({delete_time * 1000:.0f}ms){Style.RESET_ALL}")
+            for rel_path, error in delete_failed.items():
+                warn(f"Failed to delete {rel_path}: {error}")
+            failed.update(delete_failed)
+
+    for rel_path in failed:
+        if rel_path in deployed:
+            manifest[rel_path] = deployed[rel_path]
+        else:
+            manifest.pop(rel_path, None)
+    backend.write_manifest(manifest)
+
+    total_time = time.time() - start_time
+    color = Fore.RED if failed else Fore.GREEN
+    print(f"{color}Deploy complete in {total_time * 1000:.0f}ms ({len(failed)} failed){Style.RESET_ALL}\n")
+    return len(failed)
+
+
+def build_manifest(build_dir):
+    manifest = {}
+    for root, _, files in os.walk(build_dir):
+        for filename in files:
+            filepath = os.path.join(root, filename)
+            rel_path = os.path.relpath(filepath, build_dir).replace(os.sep, "/")
+            if rel_path == MANIFEST_NAME:
+                continue
+
+            digest = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            manifest[rel_path] = digest.hexdigest()
+    return dict(sorted(manifest.items()))
+
+
+def content_type(rel_path):
+    mime_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+    if mime_type.startswith("text/") or mime_type in TEXT_TYPES:
+        return f"{mime_type}; charset=utf-8"
+    return mime_type
+
+
+def cache_control(rules, rel_path):
+    for pattern, value in rules:
+        if fnmatch.fnmatch(rel_path, pattern):
+            return value
+    return "public, max-age=86400"
+
+
+def _cache_control_rules(config):
+    rules = list(cfg.get_deploy_cache_control(config).items())
+    rules += [
+        (f"{cfg.get_search_output_dir(config)}/shards/*", "public, max-age=31536000, immutable"),
+        ("*.html", REVALIDATE),
+        ("*.xml", REVALIDATE),
+        ("*.json", REVALIDATE),
+    ]
+    return rules
+
+
+def _run_all(pool, func, rel_paths):
+    failed = {}
+    futures = {rel_path: pool.submit(func, rel_path) for rel_path in rel_paths}
+    for rel_path, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            failed[rel_path] = e
+    return failed
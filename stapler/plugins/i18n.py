@@ -0,0 +1,74 @@
+import os
+
+import yaml
+
+from .. import config as cfg
+from ..core.utils import warn
+
+
+def locale_config(config, locale):
+    prefix = cfg.get_locale_prefix(config, locale)
+    site = dict(config["site"])
+    site["base_path"] = cfg.get_base_path(config) + prefix
+    site["url"] = cfg.get_site_url(config) + prefix
+    site["language"] = locale
+    return {**config, "site": site}
+
+
+def get_overlay_dir(config, locale):
+    overlay_dir = os.path.join(cfg.get_locales_dir(config), locale)
+    return overlay_dir if os.path.isdir(overlay_dir) else None
+
+
+def prefix_hooks(page_hooks, prefix):
+    if not prefix:
+        return page_hooks
+    return [lambda rel_path, content, hook=hook: hook(f"{prefix.lstrip('/')}/{rel_path}", content) for hook in page_hooks]
+
+
+def install_translations(template_env, config, locale):
+    messages = dict(load_translations(config, cfg.get_default_locale(config)))
+    messages.update(load_translations(config, locale))
+
+    def gettext(message):
+        value = messages.get(message, message)
+        return value[0] if isinstance(value, list) else value
+
+    def ngettext(singular, plural, n):
+        value = messages.get(singular)
+        if isinstance(value, list):
+            return value[0] if n == 1 else value[-1]
+        if n == 1:
+            return value or singular
+        return plural
+
+    base_path = cfg.get_base_path(config)
+    prefixes = {code: cfg.get_locale_prefix(config, code) for code in cfg.get_locales(config)}
+
+    def locale_url(path, target=None):
+        if base_path and (path == base_path or path.startswith(base_path + "/")):
+            path = path[len(base_path) :]
+        current = prefixes[locale]
+        if current and (path == current or path.startswith(current + "/")):
+            path = path[len(current) :]
+        return f"{base_path}{prefixes[target or locale]}{path or '/'}"
+
+    template_env.install_gettext_callables(gettext, ngettext, newstyle=True)
+    template_env.globals.update(
+        locale=locale,
+        locales=cfg.get_locales(config),
+        locale_url=locale_url,
+    )
+
+
+def load_translations(config, locale):
+    path = os.path.join(cfg.get_translations_dir(config), f"{locale}.yaml")
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        warn(f"Failed to load translations {path}: {e}")
+        return {}
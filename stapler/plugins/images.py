@@ -0,0 +1,189 @@
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from markupsafe import Markup
+
+from .. import config as cfg
+from ..core.utils import load_cache, save_cache, warn
+
+
+IMAGE_EXTENSIONS = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png", ".webp": "webp"}
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp", "avif": "avif"}
+MIME_TYPES = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp", "avif": "image/avif"}
+ORIENTATION_TAG = 0x0112
+
+
+def process_images(config, build_dir):
+    try:
+        from PIL import Image
+    except ImportError:
+        warn("features.images needs Pillow (pip install 'stapler-ssg[images]'), copying images as-is")
+        return {}, 0
+
+    Image.init()
+    formats = []
+    for fmt in cfg.get_image_formats(config):
+        if fmt.upper() in Image.SAVE:
+            formats.append(fmt)
+        else:
+            warn(f"Pillow cannot encode {fmt}, skipping those variants")
+
+    site_dir = cfg.get_site_dir(config)
+    images_dir = cfg.get_images_dir(config)
+    if not os.path.exists(images_dir):
+        return {}, 0
+
+    quality = cfg.get_image_quality(config)
+    widths = sorted(set(cfg.get_image_widths(config)))
+    store_dir = os.path.join(cfg.get_cache_dir(config), "images")
+
+    sources = load_cache(config, "images")
+    seen_sources = {}
+    manifest = {}
+    jobs = []
+
+    for root, dirs, files in os.walk(images_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+
+        for filename in files:
+            source_format = IMAGE_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+            if not source_format or filename.startswith("."):
+                continue
+
+            filepath = os.path.join(root, filename)
+            rel_path = os.path.relpath(filepath, site_dir).replace(os.sep, "/")
+
+            source = _describe_source(Image, filepath, sources.get(rel_path))
+            if not source:
+                continue
+            seen_sources[rel_path] = source
+
+            variants = []
+            for fmt in dict.fromkeys(formats + [source_format]):
+                for width in [w for w in widths if w < source["width"]] + [source["width"]]:
+                    if fmt == source_format and width == source["width"]:
+                        variants.append({"path": rel_path, "width": width, "format": fmt})
+                        continue
+
+                    ext = FORMAT_EXTENSIONS[fmt]
+                    key = source["key"]
+                    stored = os.path.join(store_dir, key[:2], f"{key}-{width}-q{quality}.{ext}")
+                    if not os.path.exists(stored):
+                        jobs.append((filepath, stored, width, fmt, quality))
+
+                    output = f"{rel_path}-{width}w.{ext}"
+                    variants.append({"path": output, "width": width, "format": fmt, "stored": stored})
+
+            manifest[rel_path] = {
+                "width": source["width"],
+                "height": source["height"],
+                "format": source_format,
+                "variants": variants,
+            }
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=cfg.get_image_workers(config)) as pool:
+            for job, error in zip(jobs, pool.map(_render_variant, jobs, chunksize=4)):
+                if error:
+                    warn(f"Failed to resize {job[0]}: {error}")
+
+    for image in manifest.values():
+        variants = []
+        for variant in image["variants"]:
+            stored = variant.pop("stored", None)
+            if stored:
+                if not os.path.exists(stored):
+                    continue
+                output_path = os.path.join(build_dir, variant["path"])
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                shutil.copy2(stored, output_path)
+            variants.append(variant)
+        image["variants"] = variants
+
+    save_cache(config, "images", seen_sources)
+    return manifest, len(jobs)
+
+
+def register_helpers(template_env, config, manifest):
+    base_path = cfg.get_base_path(config)
+
+    def srcset(src, format=None):
+        image = manifest.get(_site_path(src, base_path))
+        if not image:
+            return ""
+        fmt = format or image["format"]
+        return ", ".join(f"{base_path}/{v['path']} {v['width']}w" for v in image["variants"] if v["format"] == fmt)
+
+    def picture(src, alt="", sizes="100vw", **attrs):
+        rel_path = _site_path(src, base_path)
+        image = manifest.get(rel_path)
+        if not image:
+            return Markup('<img src="{}" alt="{}">').format(src, alt)
+
+        sources = Markup("").join(Markup('<source type="{}" srcset="{}" sizes="{}">').format(MIME_TYPES[fmt], srcset(src, fmt), sizes) for fmt in dict.fromkeys(v["format"] for v in image["variants"]) if fmt != image["format"])
+        extra = Markup("").join(Markup(' {}="{}"').format(name.rstrip("_").replace("_", "-"), value) for name, value in attrs.items())
+        img = Markup('<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="lazy" decoding="async"{}>').format(
+            f"{base_path}/{rel_path}",
+            srcset(src),
+            sizes,
+            image["width"],
+            image["height"],
+            alt,
+            extra,
+        )
+        return Markup("<picture>{}{}</picture>").format(sources, img)
+
+    template_env.globals["srcset"] = srcset
+    template_env.globals["picture"] = picture
+
+
+def _site_path(src, base_path):
+    if base_path and src.startswith(base_path + "/"):
+        src = src[len(base_path) :]
+    return src.lstrip("/")
+
+
+def _describe_source(Image, filepath, cached):
+    stat = os.stat(filepath)
+    if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        return cached
+
+    with open(filepath, "rb") as f:
+        key = hashlib.sha256(f.read()).hexdigest()
+
+    try:
+        with Image.open(filepath) as img:
+            width, height = img.size
+            if img.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+                width, height = height, width
+    except Exception as e:
+        warn(f"Failed to read image {filepath}: {e}")
+        return None
+
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "key": key, "width": width, "height": height}
+
+
+def _render_variant(job):
+    from PIL import Image, ImageOps
+
+    source, stored, width, fmt, quality = job
+    try:
+        with Image.open(source) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.width != width:
+                img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+
+            os.makedirs(os.path.dirname(stored), exist_ok=True)
+            temp_path = f"{stored}.{os.getpid()}.tmp"
+            if fmt == "png":
+                img.save(temp_path, format="PNG", optimize=True)
+            else:
+                img.save(temp_path, format=fmt.upper(), quality=quality)
+            os.replace(temp_path, stored)
+    except Exception as e:
+        return str(e)
+    return None
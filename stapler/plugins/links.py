@@ -0,0 +1,97 @@
+import hashlib
+import os
+import posixpath
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from .. import config as cfg
+from ..core.utils import load_cache, resolve_clean_url, save_cache
+
+
+LINK_ATTRIBUTES = {"href", "src", "poster", "data"}
+
+
+class LinkChecker:
+    def __init__(self, config):
+        self.config = config
+        self.base_path = cfg.get_base_path(config).rstrip("/")
+        self.site_url = cfg.get_site_url(config).rstrip("/")
+        self.cache = load_cache(config, "links")
+        self.pages = {}
+
+    def add_page(self, rel_path, html):
+        if not rel_path.endswith(".html"):
+            return
+
+        digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        cached = self.cache.get(rel_path)
+        if cached and cached["hash"] == digest:
+            self.pages[rel_path] = cached
+            return
+
+        parser = _LinkExtractor()
+        parser.feed(html)
+        parser.close()
+        self.pages[rel_path] = {"hash": digest, "links": sorted(set(parser.links))}
+
+    def check(self, build_dir):
+        outputs = set()
+        for root, _, files in os.walk(build_dir):
+            rel_root = os.path.relpath(root, build_dir).replace(os.sep, "/")
+            for filename in files:
+                outputs.add(filename if rel_root == "." else f"{rel_root}/{filename}")
+
+        def is_output(url_path):
+            return url_path.lstrip("/") in outputs
+
+        broken = []
+        for rel_path in sorted(self.pages):
+            for link in self.pages[rel_path]["links"]:
+                target = self._link_target(link, rel_path)
+                if target is None:
+                    continue
+                if target is False or not resolve_clean_url(target, is_output):
+                    broken.append((rel_path, link))
+
+        save_cache(self.config, "links", self.pages)
+        return broken
+
+    def _link_target(self, link, rel_path):
+        absolute = link.startswith(self.site_url + "/") or link == self.site_url
+        if absolute:
+            link = link[len(self.site_url) :] or "/"
+
+        parts = urlsplit(link)
+        if parts.scheme or parts.netloc or not parts.path:
+            return None
+
+        path = unquote(parts.path)
+        if path.startswith("/"):
+            if self.base_path and not absolute:
+                if path != self.base_path and not path.startswith(self.base_path + "/"):
+                    return False
+                path = path[len(self.base_path) :] or "/"
+        else:
+            path = posixpath.join("/" + posixpath.dirname(rel_path), path)
+
+        resolved = posixpath.normpath(path)
+        if path.endswith("/") and resolved != "/":
+            resolved += "/"
+        return resolved
+
+
+class _LinkExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if not value:
+                continue
+            if name in LINK_ATTRIBUTES:
+                self.links.append(value.strip())
+            elif name in ("srcset", "imagesrcset"):
+                for candidate in value.split(","):
+                    if candidate.strip():
+                        self.links.append(candidate.split()[0])
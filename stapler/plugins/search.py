@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+from .. import config as cfg
+from ..core.utils import load_cache, save_cache
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MIN_TOKEN_LENGTH = 2
+CACHE_VERSION = 2
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "nav", "footer"}
+
+
+class SearchIndexer:
+    def __init__(self, config):
+        self.config = config
+        self.base_path = cfg.get_base_path(config)
+        self.prefix_length = cfg.get_search_prefix_length(config)
+        self.cache = load_cache(config, "search")
+        self.pages = {}
+        self.reused = 0
+
+    def add_page(self, rel_path, html):
+        if not rel_path.endswith(".html") or os.path.basename(rel_path) == "404.html":
+            return
+
+        url = _page_url(rel_path, self.base_path)
+        digest = hashlib.sha1(f"{CACHE_VERSION}:{html}".encode("utf-8")).hexdigest()
+
+        cached = self.cache.get(url)
+        if cached and cached["hash"] == digest:
+            self.pages[url] = cached
+            self.reused += 1
+            return
+
+        title, text = _extract_text(html)
+        terms = {}
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if len(token) >= MIN_TOKEN_LENGTH:
+                terms[token] = terms.get(token, 0) + 1
+
+        self.pages[url] = {"hash": digest, "title": title or url, "terms": terms}
+
+    def write(self, build_dir):
+        output_dir = os.path.join(build_dir, cfg.get_search_output_dir(self.config))
+        shards_dir = os.path.join(output_dir, "shards")
+        os.makedirs(shards_dir, exist_ok=True)
+
+        docs = []
+        postings = {}
+        for doc_id, url in enumerate(sorted(self.pages)):
+            page = self.pages[url]
+            docs.append([url, page["title"]])
+            for term, count in page["terms"].items():
+                shard = postings.setdefault(term[: self.prefix_length], {})
+                shard.setdefault(term, []).extend((doc_id, count))
+
+        shard_files = {}
+        for prefix in sorted(postings):
+            payload = _dump(dict(sorted(postings[prefix].items())))
+            filename = f"{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}.json"
+            with open(os.path.join(shards_dir, filename), "w", encoding="utf-8") as f:
+                f.write(payload)
+            shard_files[prefix] = f"shards/{filename}"
+
+        with open(os.path.join(output_dir, "docs.json"), "w", encoding="utf-8") as f:
+            f.write(_dump(docs))
+
+        manifest = {
+            "version": 1,
+            "prefix_length": self.prefix_length,
+            "min_token_length": MIN_TOKEN_LENGTH,
+            "docs": "docs.json",
+            "shards": shard_files,
+        }
+        with open(os.path.join(output_dir, "index.json"), "w", encoding="utf-8") as f:
+            f.write(_dump(manifest))
+
+        save_cache(self.config, "search", self.pages)
+        return len(docs), len(shard_files)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.in_title = False
+        self.in_h1 = False
+        self.h1_done = False
+        self.title = ""
+        self.h1 = ""
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "h1" and not self.h1_done:
+            self.in_h1 = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag == "title":
+            self.in_title = False
+        elif tag == "h1" and self.in_h1:
+            self.in_h1 = False
+            self.h1_done = True
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+            return
+        if self.skip_depth:
+            return
+        if self.in_h1:
+            self.h1 += data
+        self.parts.append(data)
+
+
+def _extract_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    title = (parser.h1 or parser.title).strip()
+    return " ".join(title.split()), " ".join(parser.parts)
+
+
+def _page_url(rel_path, base_path=""):
+    if rel_path == "index.html":
+        path = "/"
+    elif rel_path.endswith("/index.html"):
+        path = f"/{rel_path[: -len('index.html')]}"
+    else:
+        path = f"/{rel_path[: -len('.html')]}"
+    return f"{base_path}{path}" if base_path else path
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
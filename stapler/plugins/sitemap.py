@@ -1,55 +1,79 @@
 import os
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
 
 from .. import config as cfg
 
 
 def generate_sitemap(config, build_dir, posts):
-    urlset = ET.Element("urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+    site_url = cfg.get_site_url(config)
+    locale_prefixes = {locale: cfg.get_locale_prefix(config, locale) for locale in cfg.get_locales(config)}
 
-    _add_url(urlset, f"{cfg.get_site_url(config)}/")
+    with open(os.path.join(build_dir, "sitemap.xml"), "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        if locale_prefixes:
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+        else:
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
 
-    if cfg.has_blog(config) and posts:
-        blog_section = os.path.basename(cfg.get_blog_dir(config))
-        _add_url(urlset, f"{cfg.get_site_url(config)}/{blog_section}/")
+        for locale, prefix in locale_prefixes.items() or [(None, "")]:
+            locale_posts = posts.get(locale, [])
+            locale_dir = os.path.join(build_dir, prefix.lstrip("/"))
+            skipped_dirs = [p.lstrip("/") for p in locale_prefixes.values() if p] if not prefix else []
 
-        for post in posts:
-            lastmod = post["created"].strftime("%Y-%m-%d") if post.get("created") else None
-            _add_url(
-                urlset,
-                f"{cfg.get_site_url(config)}/{blog_section}/{post['slug']}",
-                lastmod=lastmod,
-            )
+            def write_url(rel_path, url_path, lastmod=None):
+                alternates = _alternates(config, build_dir, locale_prefixes, rel_path, url_path)
+                _write_url(f, f"{site_url}{prefix}{url_path}", lastmod, alternates)
 
-    for root, _, files in os.walk(build_dir):
-        for filename in files:
-            if not filename.endswith(".html"):
-                continue
-            if filename in ["404.html", "index.html"]:
-                continue
+            write_url("index.html", "/")
 
-            filepath = os.path.join(root, filename)
-            rel_path = os.path.relpath(filepath, build_dir)
-
-            if cfg.has_blog(config):
+            if cfg.has_blog(config) and locale_posts:
                 blog_section = os.path.basename(cfg.get_blog_dir(config))
-                if rel_path.startswith(blog_section):
-                    continue
+                write_url(f"{blog_section}/index.html", f"/{blog_section}/")
+
+                for post in locale_posts:
+                    rel_path = f"{blog_section}/{post['slug']}.html"
+                    lastmod = post["created"].strftime("%Y-%m-%d") if post.get("created") else None
+                    write_url(rel_path, f"/{blog_section}/{post['slug']}", lastmod=lastmod)
+
+            for root, dirs, files in os.walk(locale_dir):
+                if root == locale_dir:
+                    dirs[:] = [d for d in dirs if d not in skipped_dirs]
+
+                for filename in files:
+                    if not filename.endswith(".html"):
+                        continue
+                    if filename in ["404.html", "index.html"]:
+                        continue
+
+                    filepath = os.path.join(root, filename)
+                    rel_path = os.path.relpath(filepath, locale_dir)
+
+                    if cfg.has_blog(config):
+                        blog_section = os.path.basename(cfg.get_blog_dir(config))
+                        if rel_path.startswith(blog_section):
+                            continue
+
+                    rel_path = rel_path.replace("\\", "/")
+                    write_url(rel_path, "/" + rel_path.replace(".html", ""))
+
+        f.write("</urlset>\n")
 
-            url_path = "/" + rel_path.replace("\\", "/").replace(".html", "")
-            _add_url(urlset, f"{cfg.get_site_url(config)}{url_path}")
 
-    tree = ET.ElementTree(urlset)
-    ET.indent(tree, space="    ")
-    tree.write(
-        os.path.join(build_dir, "sitemap.xml"),
-        encoding="utf-8",
-        xml_declaration=True,
-    )
+def _alternates(config, build_dir, locale_prefixes, rel_path, url_path):
+    alternates = []
+    for locale, prefix in locale_prefixes.items():
+        if os.path.exists(os.path.join(build_dir, prefix.lstrip("/"), rel_path)):
+            alternates.append((locale, f"{cfg.get_site_url(config)}{prefix}{url_path}"))
+            if locale == cfg.get_default_locale(config):
+                alternates.append(("x-default", alternates[-1][1]))
+    return alternates
 
 
-def _add_url(urlset, loc, lastmod=None):
-    url = ET.SubElement(urlset, "url")
-    ET.SubElement(url, "loc").text = loc
+def _write_url(f, loc, lastmod=None, alternates=()):
+    f.write("    <url>\n")
+    f.write(f"        <loc>{escape(loc)}</loc>\n")
     if lastmod:
-        ET.SubElement(url, "lastmod").text = lastmod
+        f.write(f"        <lastmod>{lastmod}</lastmod>\n")
+    for hreflang, href in alternates:
+        f.write(f'        <xhtml:link rel="alternate" hreflang={quoteattr(hreflang)} href={quoteattr(href)}/>\n')
+    f.write("    </url>\n")
@@ -1,3 +1,4 @@
+import fnmatch
 import os
 import sys
 import threading
@@ -11,33 +12,84 @@ from watchdog.observers import Observer
 
 from . import config as cfg
 from .core.engine import build_site
+from .core.utils import clear_git_cache, resolve_clean_url
+
+
+WATCHED_EVENTS = {"created", "deleted", "modified", "moved"}
+LAUNCH_DIR = os.getcwd()
 
 
 class BuildHandler(FileSystemEventHandler):
-    def __init__(self, build_func):
+    def __init__(self, build_func, config, config_path="stapler.toml"):
         self.build_func = build_func
-        self.last_build = 0
-
-    def on_modified(self, event):
-        if event.is_directory or "build" in event.src_path:
+        self.config_path = os.path.abspath(config_path)
+        self.site_dir = os.path.abspath(cfg.get_site_dir(config))
+        self.excluded_dirs = [os.path.abspath(directory) for directory in (cfg.get_build_dir(config), cfg.get_build_dev_dir(config), cfg.get_cache_dir(config))]
+        self.ignore_patterns = cfg.get_watch_ignore(config)
+        self.debounce = cfg.get_watch_debounce(config)
+        self.build_lock = threading.Lock()
+        self.timer_lock = threading.Lock()
+        self.pending_timer = None
+        self.pending_paths = []
+
+    def on_any_event(self, event):
+        if event.event_type not in WATCHED_EVENTS:
+            return
+        if event.is_directory and event.event_type == "modified":
             return
 
-        now = time.time()
-        if now - self.last_build < 1:
+        paths = [event.src_path]
+        if event.event_type == "moved":
+            paths.append(event.dest_path)
+        paths = [os.path.abspath(path) for path in paths if self._is_relevant(path)]
+        if not paths:
             return
-        self.last_build = now
 
-        if os.path.basename(event.src_path) in ["stapler.toml", "stapler.yaml", "stapler.yml"]:
+        if self.config_path in paths:
             print(f"\n{Fore.YELLOW}Config changed! Restarting...{Style.RESET_ALL}\n")
+            os.chdir(LAUNCH_DIR)
             os.execv(sys.executable, [sys.executable] + sys.argv)
 
-        rel_path = os.path.relpath(event.src_path)
-        timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
-        print(
-            f"\n{Fore.BLUE}[{timestamp}]{Style.RESET_ALL} "
-            f"{Fore.YELLOW}File changed:{Style.RESET_ALL} {rel_path}\n"
-        )
-        self.build_func()
+        with self.timer_lock:
+            self.pending_paths.extend(paths)
+            if self.pending_timer:
+                self.pending_timer.cancel()
+            self.pending_timer = threading.Timer(self.debounce, self._rebuild)
+            self.pending_timer.daemon = True
+            self.pending_timer.start()
+
+    def _rebuild(self):
+        with self.timer_lock:
+            changed = list(dict.fromkeys(self.pending_paths))
+            self.pending_paths = []
+            self.pending_timer = None
+
+        with self.build_lock:
+            timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
+            rel_path = os.path.relpath(changed[-1])
+            more = f" (+{len(changed) - 1} more)" if len(changed) > 1 else ""
+            print(
+                f"\n{Fore.BLUE}[{timestamp}]{Style.RESET_ALL} "
+                f"{Fore.YELLOW}File changed:{Style.RESET_ALL} {rel_path}{more}\n"
+            )
+            self.build_func()
+
+    def _is_relevant(self, path):
+        path = os.path.abspath(path)
+        if path == self.config_path:
+            return True
+        if not path.startswith(self.site_dir + os.sep):
+            return False
+        if any(path == excluded or path.startswith(excluded + os.sep) for excluded in self.excluded_dirs):
+            return False
+
+        rel_path = os.path.relpath(path).replace(os.sep, "/")
+        for pattern in self.ignore_patterns:
+            if fnmatch.fnmatch(rel_path, pattern):
+                return False
+            if any(fnmatch.fnmatch(part, pattern) for part in rel_path.split("/")):
+                return False
+        return True
 
 
 class StaplerHTTPServer(SimpleHTTPRequestHandler):
@@ -84,27 +136,11 @@ class StaplerHTTPServer(SimpleHTTPRequestHandler):
         )
 
     def do_GET(self):
-        path = self.translate_path(self.path)
-
-        if self.path.endswith("/") or self.path == "":
-            index_path = os.path.join(path, "index.html")
-            if os.path.isfile(index_path):
-                self.path = (
-                    self.path.rstrip("/") + "/index.html"
-                    if not self.path.endswith("index.html")
-                    else self.path
-                )
-                return super().do_GET()
-
-        if os.path.isfile(path):
+        resolved = resolve_clean_url(self.path, lambda url_path: os.path.isfile(self.translate_path(url_path)))
+        if resolved:
+            self.path = resolved
             return super().do_GET()
 
-        if not self.path.endswith("/") and "." not in os.path.basename(self.path):
-            html_path = path + ".html"
-            if os.path.isfile(html_path):
-                self.path += ".html"
-                return super().do_GET()
-
         not_found_path = os.path.join(self.directory, "404.html")
         if os.path.isfile(not_found_path):
             self.send_response(404)
@@ -117,15 +153,19 @@ class StaplerHTTPServer(SimpleHTTPRequestHandler):
         self.send_error(404, "File not found")
 
 
-def serve(config, port=8000):
+def serve(config, port=8000, config_path="stapler.toml"):
     print(f"{Fore.BLUE}=== Development Server ==={Style.RESET_ALL}\n")
 
     build_site(config, is_dev=True)
 
+    def rebuild():
+        clear_git_cache()
+        build_site(config, is_dev=True)
+
     observer = Observer()
-    handler = BuildHandler(lambda: build_site(config, is_dev=True))
+    handler = BuildHandler(rebuild, config, config_path)
     observer.schedule(handler, cfg.get_site_dir(config), recursive=True)
-    observer.schedule(handler, ".", recursive=False)
+    observer.schedule(handler, os.path.dirname(os.path.abspath(config_path)), recursive=False)
     observer.start()
 
     build_dev_dir = cfg.get_build_dev_dir(config)
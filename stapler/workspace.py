@@ -0,0 +1,102 @@
+import contextlib
+import glob
+import io
+import os
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+
+from colorama import Fore, Style
+
+from .config import load_config
+from .core.engine import build_site
+from .core.utils import export_git_cache, get_git_commit_info, load_git_cache
+
+
+CONFIG_EXTENSIONS = {".toml", ".yaml", ".yml"}
+
+
+def load_workspace(workspace_path):
+    if not os.path.exists(workspace_path):
+        raise FileNotFoundError(f"Workspace file not found: {workspace_path}")
+
+    with open(workspace_path, "rb") as f:
+        workspace = tomllib.load(f).get("workspace", {})
+
+    if not workspace.get("sites"):
+        raise ValueError("workspace.sites is required in workspace file")
+
+    workspace_path = os.path.abspath(workspace_path)
+    root = os.path.dirname(workspace_path)
+    config_paths = []
+    for pattern in workspace["sites"]:
+        if not glob.has_magic(pattern):
+            path = os.path.join(root, pattern)
+            config_paths.append(os.path.join(path, "stapler.toml") if os.path.isdir(path) else path)
+            continue
+
+        for match in sorted(glob.glob(os.path.join(root, pattern))):
+            if os.path.isdir(match):
+                match = os.path.join(match, "stapler.toml")
+                if not os.path.isfile(match):
+                    continue
+            elif os.path.splitext(match)[1] not in CONFIG_EXTENSIONS or match == workspace_path:
+                continue
+            config_paths.append(match)
+
+    return config_paths, workspace.get("jobs")
+
+
+def build_sites(config_paths, jobs=None):
+    config_paths = [os.path.abspath(path) for path in dict.fromkeys(config_paths)]
+    jobs = min(jobs or os.cpu_count() or 1, len(config_paths))
+
+    start_time = time.time()
+    print(f"{Fore.CYAN}=> Building {len(config_paths)} sites ({jobs} jobs) <={Style.RESET_ALL}")
+
+    for path in config_paths:
+        get_git_commit_info(os.path.dirname(path))
+    git_cache = export_git_cache()
+
+    if jobs == 1:
+        results = [_build_one(path) for path in config_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=load_git_cache, initargs=(git_cache,)) as pool:
+            results = list(pool.map(_build_one, config_paths))
+
+    failed = 0
+    for path, result, error, log in results:
+        name = os.path.relpath(path)
+        if error:
+            failed += 1
+            print(f"{Fore.RED}x {name}: {error}{Style.RESET_ALL}")
+            print(log, end="")
+            continue
+
+        stages = ", ".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in result["timings"].items())
+        print(f"{Fore.GREEN}> {name} {result['total_time'] * 1000:.0f}ms{Style.RESET_ALL} ({stages})")
+        for line in log.splitlines():
+            if "WARNING:" in line:
+                print(f"  {line}")
+
+    total_time = time.time() - start_time
+    color = Fore.RED if failed else Fore.GREEN
+    print(f"{color}Built {len(results) - failed}/{len(results)} sites in {total_time * 1000:.0f}ms{Style.RESET_ALL}\n")
+    return failed
+
+
+def _build_one(config_path):
+    log = io.StringIO()
+    previous_dir = os.getcwd()
+    try:
+        if not os.path.isfile(config_path):
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        os.chdir(os.path.dirname(config_path))
+        with contextlib.redirect_stdout(log):
+            config = load_config(os.path.basename(config_path))
+            result = build_site(config)
+        return config_path, result, None, log.getvalue()
+    except Exception as e:
+        return config_path, None, str(e), log.getvalue()
+    finally:
+        os.chdir(previous_dir)